@@ -1,12 +1,15 @@
 import smbus2 as smbus
 import time
-import csv
 import psutil
-import matplotlib.pyplot as plt
-from collections import deque
 from datetime import datetime
+from struct import unpack_from
 import os
+import sys
+import glob
 import argparse
+import signal
+import threading
+from collections import deque
 from colorama import Fore, Style, init
 
 # Initialize colorama for colored terminal output
@@ -20,28 +23,56 @@ _REG_POWER = 0x03
 _REG_CURRENT = 0x04
 _REG_CALIBRATION = 0x05
 
+# INA219 32V/2A calibration constants
+_CONFIG_32V_2A = 0x2000 | 0x1800 | 0x07  # 32V, 320mV gain, continuous mode
+_CURRENT_LSB = 0.1  # Current LSB = 100uA per bit
+_POWER_LSB = 0.002  # Power LSB = 2mW per bit
+
 # Configurable Constants
 I2C_BUS = 1
 I2C_ADDRESS = 0x41
 SAMPLE_INTERVAL = 2  # Data sampling interval in seconds
 BATTERY_CAPACITY_WH = 100  # UPS battery capacity in watt-hours
+SYSTEM_SAMPLE_EVERY = 5  # Read CPU temperature, CPU usage, and memory usage once every N samples
+CPU_THERMAL_ZONE_TYPES = ("cpu-thermal", "cpu_thermal")  # sysfs thermal zone types of the CPU sensor
+PLOT_WINDOW = 50  # Number of most recent samples shown in the plot
+PLOT_REDRAW_EVERY = 5  # Redraw the plot once every N samples
+LOG_BUFFER_SIZE = 0x10000  # Size of the CSV log write buffer in bytes
+LOG_FLUSH_THRESHOLD = 0xE000  # Buffered bytes that trigger a write, leaving headroom for more rows
+LOG_FLUSH_INTERVAL = 30  # Maximum time buffered log rows stay in memory, in seconds
+LOG_QUEUE_SIZE = 1024  # Rows the background logger may fall behind by before dropping the oldest
+
+# CSV log header; rows keep the "\r\n" terminator csv.writer used so existing logs stay consistent
+CSV_HEADER = ("Timestamp,Load Voltage (V),Current (A),Power (W),Percent (%),"
+              "CPU Temp (°C),CPU Usage (%),Memory Usage (%),Remaining Time (min)\r\n")
+# Bound str.format for one log row, filling the first eight CSV_HEADER columns
+CSV_ROW_FORMAT = "{},{:.4f},{:.6f},{:.4f},{:.2f},{},{:.1f},{:.1f}\r\n".format
+
+# Console layout for display_reading, with the colorama escapes resolved once at import
+DISPLAY_FORMAT = (
+    f"{Fore.CYAN}[{{timestamp}}]{Style.RESET_ALL}\n"
+    f"{Fore.GREEN}Load Voltage:{Style.RESET_ALL}   {{bus_voltage:.3f}} V\n"
+    f"{Fore.YELLOW}Current:{Style.RESET_ALL}        {{current:.6f}} A\n"
+    f"{Fore.MAGENTA}Power:{Style.RESET_ALL}          {{power:.3f}} W\n"
+    f"{Fore.LIGHTBLUE_EX}Battery:{Style.RESET_ALL}       {{percent:.1f}}%\n"
+    f"{Fore.RED}CPU Temp:{Style.RESET_ALL}       {{cpu_temp}}\n"
+    f"{Fore.CYAN}CPU Usage:{Style.RESET_ALL}      {{cpu_usage:.1f}}%\n"
+    f"{Fore.LIGHTYELLOW_EX}Memory Usage:{Style.RESET_ALL} {{memory_usage:.1f}}%\n"
+    f"{Fore.LIGHTGREEN_EX}Status:{Style.RESET_ALL}       {{power_stage}}\n"
+    f"{Fore.LIGHTGREEN_EX}Remaining Time:{Style.RESET_ALL} {{remaining_time}}\n"
+)
 
 # Thresholds for Alerts
 MAX_VOLTAGE = 15.0
 MAX_CURRENT = 2.0
 MAX_POWER = 10.0
 
-# Plot initialization and data buffers for optional plotting
-plt.ion()
-fig, (ax1, ax2, ax3) = plt.subplots(3, 1)
-time_window = deque(maxlen=50)
-voltage_data = deque(maxlen=50)
-current_data = deque(maxlen=50)
-power_data = deque(maxlen=50)
-
 class INA219:
     """Class to interface with the INA219 sensor for voltage, current, and power readings."""
 
+    _PERCENT_BASE = 9.0  # Bus voltage reported as 0% charge
+    _PERCENT_K = 100.0 / 3.6  # Percent per volt above _PERCENT_BASE (3.6 V span)
+
     def __init__(self, i2c_bus=I2C_BUS, addr=I2C_ADDRESS, shunt_resistance=0.1):
         """
         Initializes the INA219 with default calibration for 32V and 2A range.
@@ -54,31 +85,68 @@ class INA219:
         self.bus = smbus.SMBus(i2c_bus)
         self.addr = addr
         self.shunt_resistance = shunt_resistance
-        self._current_lsb = 0.1  # Current LSB = 100uA per bit
-        self._power_lsb = 0.002  # Power LSB = 2mW per bit
+        self._current_lsb = _CURRENT_LSB
+        self._power_lsb = _POWER_LSB
+        # Bus methods bound once so the read paths skip the self.bus attribute chain
+        self._read_i2c_block_data = self.bus.read_i2c_block_data
+        self._write_i2c_block_data = self.bus.write_i2c_block_data
+        self._i2c_rdwr = self.bus.i2c_rdwr
+        # sample() reuses the same messages on every call; the read buffers are refilled in place
+        self._sample_msgs, self._sample_reads = self._block_msgs(_REG_SHUNTVOLTAGE, 4)
         self.set_calibration_32V_2A()
 
     def write(self, address, data):
         """Writes a 16-bit value to a register on the INA219 sensor."""
         temp = [data >> 8, data & 0xFF]
-        self.bus.write_i2c_block_data(self.addr, address, temp)
+        self._write_i2c_block_data(self.addr, address, temp)
 
     def read(self, address):
         """Reads a 16-bit value from a register on the INA219 sensor."""
-        data = self.bus.read_i2c_block_data(self.addr, address, 2)
-        return (data[0] << 8) | data[1]
+        data = self._read_i2c_block_data(self.addr, address, 2)
+        return unpack_from('>H', bytes(data))[0]
+
+    def read_signed(self, address):
+        """Reads a signed (two's complement) 16-bit value from a register on the INA219 sensor."""
+        data = self._read_i2c_block_data(self.addr, address, 2)
+        return unpack_from('>h', bytes(data))[0]
+
+    def read_block(self, start, count):
+        """
+        Reads consecutive 16-bit registers in a single combined I2C transfer.
+
+        The INA219 does not auto-increment its register pointer, so each register
+        gets its own pointer write and 2-byte read, all issued in one i2c_rdwr call.
+
+        Parameters:
+        start (int): The first register address.
+        count (int): The number of registers to read.
+
+        Returns:
+        list: The raw register bytes, MSB first, 2 bytes per register.
+        """
+        msgs, reads = self._block_msgs(start, count)
+        self._i2c_rdwr(*msgs)
+        return [byte for read in reads for byte in read]
+
+    def _block_msgs(self, start, count):
+        """Builds the pointer-write/read message pairs for read_block() and sample()."""
+        reads = [smbus.i2c_msg.read(self.addr, 2) for _ in range(count)]
+        msgs = []
+        for offset, read in enumerate(reads):
+            msgs.append(smbus.i2c_msg.write(self.addr, [start + offset]))
+            msgs.append(read)
+        return msgs, reads
 
     def set_calibration_32V_2A(self):
         """Sets the INA219 to measure up to 32V and 2A."""
         self._cal_value = int(0.04096 / (self._current_lsb * self.shunt_resistance))
         self.write(_REG_CALIBRATION, self._cal_value)
-        self.config = (0x2000 | 0x1800 | 0x07)  # 32V, 320mV gain, continuous mode
+        self.config = _CONFIG_32V_2A
         self.write(_REG_CONFIG, self.config)
 
     def getShuntVoltage_mV(self):
         """Returns the shunt voltage in mV."""
-        value = self.read(_REG_SHUNTVOLTAGE)
-        return ((value - 65536) if value > 32767 else value) * 0.01
+        return self.read_signed(_REG_SHUNTVOLTAGE) * 0.01
 
     def getBusVoltage_V(self):
         """Returns the bus voltage in V."""
@@ -87,18 +155,31 @@ class INA219:
 
     def getCurrent_mA(self):
         """Returns the current in mA."""
-        value = self.read(_REG_CURRENT)
-        return ((value - 65536) if value > 32767 else value) * self._current_lsb
+        return self.read_signed(_REG_CURRENT) * self._current_lsb
 
     def getPower_W(self):
         """Returns the power in W."""
-        value = self.read(_REG_POWER)
-        return ((value - 65536) if value > 32767 else value) * self._power_lsb
+        return self.read_signed(_REG_POWER) * self._power_lsb
+
+    def sample(self, _power_lsb=_POWER_LSB, _current_lsb=_CURRENT_LSB):
+        """
+        Reads shunt voltage, bus voltage, power, and current in one bus transfer.
+
+        The scale factors are bound as default arguments and the I2C messages are
+        prebuilt, so the hot path is local lookups plus one i2c_rdwr call.
+
+        Returns:
+        tuple: (shunt voltage in mV, bus voltage in V, power in W, current in mA).
+        """
+        self._i2c_rdwr(*self._sample_msgs)
+        # Bus voltage is the only unsigned register; its data sits in bits 15-3
+        shunt, bus, power, current = unpack_from('>hHhh', b"".join(map(bytes, self._sample_reads)))
+        return shunt * 0.01, (bus >> 3) * 0.004, power * _power_lsb, current * _current_lsb
 
     def getPercent(self, bus_voltage):
         """Calculates battery percentage based on bus voltage."""
-        percent = ((bus_voltage - 9) / 3.6) * 100
-        return min(max(percent, 0), 100)
+        percent = (bus_voltage - self._PERCENT_BASE) * self._PERCENT_K
+        return 0.0 if percent < 0.0 else (100.0 if percent > 100.0 else percent)
 
     def estimate_remaining_time(self, current_power_draw):
         """
@@ -115,6 +196,223 @@ class INA219:
             return min(10000, remaining_time_hours * 60)  # Limits time to avoid impractical values
         return None
 
+class LogWriteError(Exception):
+    """Raised by CSVLogger when the CSV log file cannot be opened or written; wraps the underlying OSError."""
+
+class CSVLogger:
+    """Writes formatted CSV rows from a background thread so disk latency never delays sampling."""
+
+    def __init__(self, path, header):
+        """
+        Opens the log file, writes the header if the file is empty, and starts the writer thread.
+
+        Parameters:
+        path (str): Path of the CSV log file.
+        header (str): Header row written when the file is new or empty.
+
+        Raises:
+        LogWriteError: If the log file cannot be opened or the header cannot be written.
+        """
+        # Unbuffered: rows are coalesced in our own buffer and handed to the kernel with os.write
+        try:
+            self.file = open(path, mode="ab", buffering=0)
+        except OSError as e:
+            raise LogWriteError(e) from e
+        self._fd = self.file.fileno()
+        self._buffer = memoryview(bytearray(LOG_BUFFER_SIZE))
+        self._used = 0
+        try:
+            # Checking the size (not existence) also repairs a file left empty by an earlier crash
+            if os.path.getsize(path) == 0:
+                # Persist the header right away so a crash before the first flush cannot lose it
+                self._append(header)
+                self._write_buffer()
+                os.fsync(self._fd)
+        except OSError as e:
+            self.file.close()
+            raise LogWriteError(e) from e
+        self.dropped = 0  # Rows discarded because the queue was full
+        self.error = None  # OSError that stopped the writer thread, if any
+        self._error_raised = False  # Whether log() has already passed self.error to the caller
+        # Single producer / single consumer, so deque's atomic append/popleft need no extra lock
+        self._queue = deque(maxlen=LOG_QUEUE_SIZE)
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="csv-logger", daemon=True)
+        self._thread.start()
+
+    def log(self, row):
+        """
+        Queues a formatted row for writing; if the writer is behind, the oldest queued row is dropped.
+
+        Raises:
+        LogWriteError: If the writer thread has stopped because writing the log file failed.
+        """
+        if self.error is not None:
+            self._error_raised = True
+            raise LogWriteError(self.error) from self.error
+        if len(self._queue) == LOG_QUEUE_SIZE:
+            self.dropped += 1
+        self._queue.append(row)
+        self._wake.set()
+
+    def close(self):
+        """
+        Drains the queued rows, then writes out the buffer, fsyncs, and closes the log file.
+
+        The file is always closed, and nothing is written if the writer thread already failed.
+
+        Returns:
+        OSError: A write error that log() has not already raised to the caller, or None.
+        """
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        try:
+            if self.error is None:
+                self._write_buffer()
+                os.fsync(self._fd)
+        except OSError as e:
+            self.error = e
+        finally:
+            self.file.close()
+        return None if self._error_raised else self.error
+
+    def _append(self, row):
+        """Encodes a row into the write buffer, writing the buffer out first if the row does not fit."""
+        data = row.encode()
+        if self._used + len(data) > LOG_BUFFER_SIZE:
+            self._write_buffer()
+        self._buffer[self._used:self._used + len(data)] = data
+        self._used += len(data)
+
+    def _write_buffer(self):
+        """Hands all buffered bytes to the kernel, retrying short writes."""
+        pending = self._buffer[:self._used]
+        while pending:
+            pending = pending[os.write(self._fd, pending):]
+        self._used = 0
+
+    def _run(self):
+        """Writer thread: buffers queued rows and writes them out in large blocks until close() is called."""
+        try:
+            self._write_loop()
+        except OSError as e:
+            self.error = e  # Reported to the sampling loop by the next log() call
+
+    def _write_loop(self):
+        """Body of the writer thread; write errors propagate to _run()."""
+        last_flush = time.monotonic()
+        while True:
+            self._wake.wait(LOG_FLUSH_INTERVAL)  # Times out so the timed flush still happens
+            self._wake.clear()
+            stopping = self._stopping  # Read before draining so no row logged before close() is missed
+            while True:
+                try:
+                    self._append(self._queue.popleft())
+                except IndexError:
+                    break
+            if stopping:
+                break
+            if self._used > LOG_FLUSH_THRESHOLD or time.monotonic() - last_flush >= LOG_FLUSH_INTERVAL:
+                self._write_buffer()
+                last_flush = time.monotonic()
+
+class LivePlot:
+    """Real-time plot of the most recent voltage, current, and power samples."""
+
+    def __init__(self, window=PLOT_WINDOW):
+        """
+        Creates the figure and its line artists, which are updated in place on every redraw.
+
+        matplotlib and numpy are imported here rather than at module level so headless
+        runs never load them; numpy is kept on the instance for update().
+
+        Parameters:
+        window (int): Number of most recent samples kept and shown.
+        """
+        import matplotlib.dates as mdates
+        import matplotlib.pyplot as plt
+        import numpy as np
+        from dateutil import tz  # Installed with matplotlib
+
+        self._np = np
+        plt.ion()
+        self.fig, axes = plt.subplots(3, 1)
+        self._lines = []
+        for ax, title, color in zip(axes, ("Load Voltage (V)", "Current (A)", "Power (W)"),
+                                    ("blue", "orange", "green")):
+            line, = ax.plot([], [], label=title, color=color)
+            ax.set_title(title)
+            ax.xaxis_date(tz.tzlocal())  # Local time, DST-aware, matching the log timestamps
+            self._lines.append((ax, line))
+        # Matplotlib date number of the UNIX epoch, used to convert buffered UNIX times for the x axis
+        self._epoch_datenum = mdates.date2num(datetime(1970, 1, 1))
+        # Ring buffer of (UNIX time, voltage, current, power) rows; _head is the next slot to write
+        self._buffer = np.empty((window, 4), dtype=np.float64)
+        self._window = window
+        self._head = 0
+        self._count = 0
+
+    def add(self, timestamp, bus_voltage, current, power):
+        """Appends a sample, overwriting the oldest one once the window is full."""
+        self._buffer[self._head] = (timestamp, bus_voltage, current, power)
+        self._head = (self._head + 1) % self._window
+        self._count = min(self._count + 1, self._window)
+
+    def update(self):
+        """Pushes the buffered samples into the line artists and schedules a non-blocking redraw."""
+        # Rotate the filled part of the ring buffer into chronological order
+        data = self._np.roll(self._buffer[:self._count], -self._head, axis=0)
+        times = self._epoch_datenum + data[:, 0] / 86400.0
+        for column, (ax, line) in enumerate(self._lines, start=1):
+            line.set_data(times, data[:, column])
+            ax.relim()
+            ax.autoscale_view()
+        self.fig.canvas.draw_idle()
+        self.process_events()
+
+    def process_events(self):
+        """Handles pending GUI events so the window stays responsive between redraws."""
+        self.fig.canvas.flush_events()
+
+def open_cpu_thermal_zone():
+    """
+    Finds the CPU thermal zone in sysfs and opens its temperature file for repeated reads.
+
+    Returns:
+    int: File descriptor of the zone's temp file, or None if no CPU thermal zone was found.
+    """
+    for zone in sorted(glob.glob("/sys/class/thermal/thermal_zone*")):
+        try:
+            with open(os.path.join(zone, "type")) as f:
+                zone_type = f.read().strip()
+        except OSError:
+            continue
+        if zone_type in CPU_THERMAL_ZONE_TYPES:
+            return os.open(os.path.join(zone, "temp"), os.O_RDONLY)
+    return None
+
+def get_cpu_temp(thermal_fd=None):
+    """
+    Returns the CPU temperature in °C, or None if no CPU thermal sensor is available.
+
+    Parameters:
+    thermal_fd (int): Descriptor from open_cpu_thermal_zone(); psutil is used when None.
+    """
+    if thermal_fd is not None:
+        try:
+            os.lseek(thermal_fd, 0, os.SEEK_SET)
+            return int(os.read(thermal_fd, 16)) / 1000.0  # sysfs reports milli-°C
+        except (OSError, ValueError):
+            return None
+    entry = psutil.sensors_temperatures().get('cpu_thermal')
+    return entry[0].current if entry else None
+
+def handle_sigterm(signum, frame):
+    """Turns SIGTERM (service stop, UPS-triggered shutdown) into SystemExit so buffered log rows are persisted."""
+    raise SystemExit(0)  # A requested stop is a clean exit
+
 def display_reading(timestamp, bus_voltage, current, power, percent, cpu_temp, cpu_usage, memory_usage, remaining_time):
     """
     Displays a formatted summary of key metrics with color highlights for easy readability.
@@ -125,7 +423,7 @@ def display_reading(timestamp, bus_voltage, current, power, percent, cpu_temp, c
     current (float): Current reading in A.
     power (float): Power reading in W.
     percent (float): Battery percentage.
-    cpu_temp (float): CPU temperature in °C.
+    cpu_temp (float): CPU temperature in °C, or None if unavailable.
     cpu_usage (float): CPU usage percentage.
     memory_usage (float): Memory usage percentage.
     remaining_time (float): Estimated remaining time in minutes.
@@ -150,17 +448,12 @@ def display_reading(timestamp, bus_voltage, current, power, percent, cpu_temp, c
     else:
         remaining_time_display = f"{remaining_time:.2f} min" if remaining_time else "Calculating..."
 
-    # Display output with power stage and remaining time
-    print(f"{Fore.CYAN}[{timestamp}]{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}Load Voltage:{Style.RESET_ALL}   {bus_voltage:.3f} V")
-    print(f"{Fore.YELLOW}Current:{Style.RESET_ALL}        {current:.6f} A")
-    print(f"{Fore.MAGENTA}Power:{Style.RESET_ALL}          {power:.3f} W")
-    print(f"{Fore.LIGHTBLUE_EX}Battery:{Style.RESET_ALL}       {percent:.1f}%")
-    print(f"{Fore.RED}CPU Temp:{Style.RESET_ALL}       {cpu_temp:.1f}°C")
-    print(f"{Fore.CYAN}CPU Usage:{Style.RESET_ALL}      {cpu_usage:.1f}%")
-    print(f"{Fore.LIGHTYELLOW_EX}Memory Usage:{Style.RESET_ALL} {memory_usage:.1f}%")
-    print(f"{Fore.LIGHTGREEN_EX}Status:{Style.RESET_ALL}       {power_stage}")
-    print(f"{Fore.LIGHTGREEN_EX}Remaining Time:{Style.RESET_ALL} {remaining_time_display}")
+    # Display output with power stage and remaining time in a single write
+    sys.stdout.write(DISPLAY_FORMAT.format(
+        timestamp=timestamp, bus_voltage=bus_voltage, current=current, power=power, percent=percent,
+        cpu_temp=f"{cpu_temp:.1f}°C" if cpu_temp is not None else "N/A",
+        cpu_usage=cpu_usage, memory_usage=memory_usage, power_stage=power_stage,
+        remaining_time=remaining_time_display))
 
 
 
@@ -172,61 +465,73 @@ if __name__ == '__main__':
     args = parser.parse_args()
 
     ina219 = INA219()
+    plot = LivePlot() if args.show_plot else None
     log_file = "ina219_data_log.csv"
-    file_exists = os.path.isfile(log_file)
 
     # Setup CSV logging with headers if the file is new
+    logger = None
+    thermal_fd = open_cpu_thermal_zone()
+    signal.signal(signal.SIGTERM, handle_sigterm)
     try:
-        with open(log_file, mode="a", newline="") as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(["Timestamp", "Load Voltage (V)", "Current (A)", "Power (W)", "Percent (%)",
-                                 "CPU Temp (°C)", "CPU Usage (%)", "Memory Usage (%)", "Remaining Time (min)"])
-
-            while True:
-                # Retrieve data from INA219 and system metrics
-                bus_voltage = ina219.getBusVoltage_V()
-                current = ina219.getCurrent_mA() / 1000
-                power = ina219.getPower_W()
-                percent = ina219.getPercent(bus_voltage)
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                is_on_battery = bus_voltage < 12.0  # Detect if running on battery
-                cpu_temp = psutil.sensors_temperatures().get('cpu_thermal', [])[0].current if psutil.sensors_temperatures().get('cpu_thermal') else None
-                cpu_usage = psutil.cpu_percent()
+        logger = CSVLogger(log_file, CSV_HEADER)
+        iteration = 0
+        cpu_temp = None
+        sample = ina219.sample  # Bound once outside the loop
+        next_tick = time.monotonic()
+
+        while True:
+            # Retrieve data from INA219 and system metrics
+            shunt_voltage, bus_voltage, power, current = sample()
+            current /= 1000
+            percent = ina219.getPercent(bus_voltage)
+            now = time.time()
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            is_on_battery = bus_voltage < 12.0  # Detect if running on battery
+            if iteration % SYSTEM_SAMPLE_EVERY == 0:  # System metrics change slowly; reuse the last values
+                cpu_temp = get_cpu_temp(thermal_fd)
+                cpu_usage = psutil.cpu_percent()  # Averaged over the time since the previous call
                 memory_usage = psutil.virtual_memory().percent
-                remaining_time = ina219.estimate_remaining_time(power)
-
-                # Display readings in a clear format
-                display_reading(timestamp, bus_voltage, current, power, percent, cpu_temp, cpu_usage, memory_usage, remaining_time)
-
-                # Log data to CSV file
-                writer.writerow([timestamp, bus_voltage, current, power, percent, cpu_temp, cpu_usage, memory_usage])
-                file.flush()
-
-                # Display plot if requested
-                if args.show_plot:
-                    time_window.append(datetime.now())
-                    voltage_data.append(bus_voltage)
-                    current_data.append(current)
-                    power_data.append(power)
-
-                    ax1.clear()
-                    ax1.plot(time_window, voltage_data, label="Voltage (V)", color="blue")
-                    ax2.clear()
-                    ax2.plot(time_window, current_data, label="Current (A)", color="orange")
-                    ax3.clear()
-                    ax3.plot(time_window, power_data, label="Power (W)", color="green")
-
-                    ax1.set_title("Load Voltage (V)")
-                    ax2.set_title("Current (A)")
-                    ax3.set_title("Power (W)")
-                    plt.pause(0.05)
-
-                time.sleep(args.log_interval)
-
+            remaining_time = ina219.estimate_remaining_time(power)
+
+            # Display readings in a clear format
+            display_reading(timestamp, bus_voltage, current, power, percent, cpu_temp, cpu_usage, memory_usage, remaining_time)
+
+            # Log data to CSV file
+            logger.log(CSV_ROW_FORMAT(timestamp, bus_voltage, current, power, percent,
+                                      '' if cpu_temp is None else cpu_temp, cpu_usage, memory_usage))
+
+            # Display plot if requested
+            if plot is not None:
+                plot.add(now, bus_voltage, current, power)
+                if iteration % PLOT_REDRAW_EVERY == 0:  # Each sample barely changes the window
+                    plot.update()
+                else:
+                    plot.process_events()
+
+            iteration += 1
+
+            # Sleep until the next fixed deadline so loop work does not stretch the interval
+            next_tick += args.log_interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()  # Fell behind (e.g. a long stall); restart the schedule
+
+    except LogWriteError as e:
+        print("Log file error:", e)
     except IOError as e:
         print("I2C communication error:", e)
     except KeyboardInterrupt:
         print("\nScript interrupted by user.")
     finally:
+        # Persist any buffered rows before exiting
+        if logger is not None:
+            error = logger.close()
+            if error is not None:
+                print("Log file error:", error)
+            if logger.dropped:
+                print(f"Dropped {logger.dropped} log rows while the disk was busy.")
+        if thermal_fd is not None:
+            os.close(thermal_fd)
         print("Script terminated.")